@@ -1,67 +1,503 @@
+import errno
+import hashlib
+import os
+import subprocess
+import sys
+import types
+import threading
+import time
 import pytest
-from unittest.mock import patch, mock_open, MagicMock
-from tools.net import verify_file_checksum, check_dotnet_installed, list_installed_dotnets, download_file_part, download_file, install_software, uninstall_dotnet
+import requests
+from unittest.mock import patch, MagicMock
+from tools.net import NDP_REGISTRY_KEY, RangeNotSupportedError, _hash_file_range, verify_file_checksum, _registry_snapshot, check_dotnet_installed, list_installed_dotnets, download_file_part, download_file, install_software, uninstall_dotnet, run_batch, parse_arguments, main
 
 
-def test_verify_file_checksum():
-    with patch("builtins.open", mock_open(read_data=b"test data")):
+def test_verify_file_checksum(tmp_path):
+    target = tmp_path / "dummy_path"
+    target.write_bytes(b"test data")
+    assert verify_file_checksum(
+        target, "eb733a00c0c9d336e65691a37ab54293", "md5") == True
+    assert verify_file_checksum(
+        target, "wrong_checksum", "md5") == False
+
+
+def test_verify_file_checksum_chunked_fallback(tmp_path):
+    target = tmp_path / "dummy_path"
+    target.write_bytes(b"test data" * 3)
+    legacy_hashlib = MagicMock(spec=["new"], new=hashlib.new)
+    with patch("tools.net.HASH_CHUNK_SIZE", 4), patch("tools.net.hashlib", legacy_hashlib), \
+            patch("tools.net.mmap.mmap", side_effect=OSError(errno.ENOMEM, "out of memory")):
         assert verify_file_checksum(
-            "dummy_path", "9e107d9d372bb6826bd81d3542a419d6", "md5") == True
+            target, hashlib.sha256(b"test data" * 3).hexdigest()) == True
+
+
+def test_verify_file_checksum_empty_file(tmp_path):
+    target = tmp_path / "dummy_path"
+    target.write_bytes(b"")
+    assert verify_file_checksum(target, hashlib.sha256(b"").hexdigest()) == True
+
+
+@patch("tools.net.mmap.mmap", side_effect=OverflowError("file too large"))
+def test_verify_file_checksum_unmappable_file(mock_mmap, tmp_path):
+    target = tmp_path / "dummy_path"
+    target.write_bytes(b"test data")
+    assert verify_file_checksum(target, hashlib.sha256(b"test data").hexdigest()) == True
+    mock_mmap.assert_called_once()
+
+
+def test_verify_file_checksum_optional_algorithm(tmp_path):
+    target = tmp_path / "dummy_path"
+    target.write_bytes(b"test data")
+    fake_xxhash = types.SimpleNamespace(xxh128=hashlib.sha1)
+    with patch.dict(sys.modules, {"xxhash": fake_xxhash}):
         assert verify_file_checksum(
-            "dummy_path", "wrong_checksum", "md5") == False
+            target, hashlib.sha1(b"test data").hexdigest(), "xxh128") == True
 
 
-@patch("subprocess.run")
-def test_check_dotnet_installed(mock_run):
-    mock_run.return_value = MagicMock(returncode=0, stdout="v4\\Client")
+def test_verify_file_checksum_optional_algorithm_missing(tmp_path):
+    target = tmp_path / "dummy_path"
+    target.write_bytes(b"test data")
+    with patch.dict(sys.modules, {"blake3": None}):
+        with pytest.raises(ValueError):
+            verify_file_checksum(target, "0" * 64, "blake3")
+
+
+class FakeRegistryKey:
+    def __init__(self, values=None, subkeys=None, denied=False):
+        self.values = values or {}
+        self.subkeys = subkeys or {}
+        self.denied = denied
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def Close(self):
+        pass
+
+
+class FakeWinreg:
+    """Minimal in-memory stand-in for the winreg module."""
+
+    KEY_ALL_ACCESS = 0xF003F
+
+    def __init__(self, ndp):
+        self.HKEY_LOCAL_MACHINE = FakeRegistryKey(subkeys={
+            "SOFTWARE": FakeRegistryKey(subkeys={
+                "Microsoft": FakeRegistryKey(subkeys={
+                    "NET Framework Setup": FakeRegistryKey(subkeys={"NDP": ndp})
+                })
+            })
+        })
+
+    def OpenKey(self, key, sub_key, reserved=0, access=0):
+        for name in sub_key.split("\\"):
+            if name not in key.subkeys:
+                raise FileNotFoundError(sub_key)
+            key = key.subkeys[name]
+            if key.denied:
+                raise PermissionError(sub_key)
+        return key
+
+    def EnumKey(self, key, index):
+        try:
+            return list(key.subkeys)[index]
+        except IndexError:
+            raise OSError("No more data is available")
+
+    def EnumValue(self, key, index):
+        try:
+            name, value = list(key.values.items())[index]
+        except IndexError:
+            raise OSError("No more data is available")
+        return name, value, 4
+
+    def DeleteKey(self, key, sub_key):
+        *parents, name = sub_key.split("\\")
+        if parents:
+            key = self.OpenKey(key, "\\".join(parents))
+        if key.subkeys[name].subkeys:
+            raise PermissionError(sub_key)
+        del key.subkeys[name]
+
+
+@pytest.fixture
+def fake_winreg():
+    ndp = FakeRegistryKey(subkeys={
+        "v4": FakeRegistryKey(subkeys={
+            "Client": FakeRegistryKey(values={"Install": 1, "Version": "4.8.04084"}),
+            "Full": FakeRegistryKey(values={"Install": 1}),
+        })
+    })
+    fake = FakeWinreg(ndp)
+    with patch("tools.net.winreg", fake):
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def clear_registry_snapshot():
+    _registry_snapshot.cache_clear()
+    yield
+    _registry_snapshot.cache_clear()
+
+
+RANGE_HEADERS = {"content-length": "24", "accept-ranges": "bytes"}
+
+
+@pytest.fixture
+def fake_server():
+    """
+    Patches the HEAD and GET requests of requests.Session. The yielded function
+    configures the responses and returns the GET mock.
+    """
+    with patch("requests.Session.head") as mock_head, patch("requests.Session.get") as mock_get:
+        def configure(headers=RANGE_HEADERS, chunks=(b"part of file",), status=206,
+                      url="http://example.com"):
+            mock_head.return_value = MagicMock(url=url, headers=headers)
+            mock_get.return_value.status_code = status
+            mock_get.return_value.iter_content.return_value = list(chunks)
+            return mock_get
+        yield configure
+
+
+@pytest.fixture
+def part_fd(tmp_path):
+    """An open descriptor of a 20-byte zero-filled file, and the file's path."""
+    target = tmp_path / "dummy_file"
+    target.write_bytes(b"\0" * 20)
+    fd = os.open(target, os.O_RDWR)
+    yield fd, target
+    os.close(fd)
+
+
+def range_session(chunks=(), status=206):
+    session = MagicMock()
+    session.get.return_value.status_code = status
+    session.get.return_value.iter_content.return_value = list(chunks)
+    return session
+
+
+def test_check_dotnet_installed(fake_winreg):
     assert check_dotnet_installed("v4\\Client") == True
-    mock_run.return_value = MagicMock(returncode=1, stdout="")
-    assert check_dotnet_installed("v4\\Client") == False
+    assert check_dotnet_installed("v3.5") == False
 
 
-@patch("subprocess.run")
-def test_list_installed_dotnets(mock_run):
-    mock_run.return_value = MagicMock(
-        returncode=0, stdout="v4\\Client\nv4\\Full")
+def test_check_dotnet_installed_case_insensitive(fake_winreg):
+    assert check_dotnet_installed("V4\\client") == True
+
+
+def test_registry_snapshot_skips_unreadable_subkeys(fake_winreg):
+    ndp = fake_winreg.OpenKey(fake_winreg.HKEY_LOCAL_MACHINE, NDP_REGISTRY_KEY)
+    ndp.subkeys["v3.5"] = FakeRegistryKey(values={"Install": 1}, denied=True)
+    assert check_dotnet_installed("v4\\Client") == True
+    assert check_dotnet_installed("v3.5") == True
+    assert _registry_snapshot()["v3.5"] == {}
+
+
+def test_check_dotnet_installed_without_winreg():
+    with patch("tools.net.winreg", None):
+        assert check_dotnet_installed("v4\\Client") == False
+
+
+def test_registry_snapshot_properties(fake_winreg):
+    snapshot = _registry_snapshot()
+    assert snapshot["v4\\Client"] == {"Install": 1, "Version": "4.8.04084"}
+    assert snapshot["v4\\Full"] == {"Install": 1}
+
+
+def test_list_installed_dotnets(fake_winreg):
+    ndp = fake_winreg.OpenKey(fake_winreg.HKEY_LOCAL_MACHINE, NDP_REGISTRY_KEY)
+    ndp.subkeys["v3.0"] = FakeRegistryKey(subkeys={
+        "Setup": FakeRegistryKey(subkeys={"1033": FakeRegistryKey(values={"Install": 1})})
+    })
     with patch("builtins.print") as mock_print:
         list_installed_dotnets()
-        mock_print.assert_any_call("Installed .NET Framework versions:")
-        mock_print.assert_any_call("v4\\Client")
-        mock_print.assert_any_call("v4\\Full")
+    assert [c.args for c in mock_print.call_args_list] == [
+        ("Installed .NET Framework versions:",), ("v4",), ("v3.0",)]
 
 
-@patch("requests.get")
-def test_download_file_part(mock_get):
-    mock_response = MagicMock()
-    mock_response.content = b"part of file"
-    mock_get.return_value = mock_response
+def test_download_file_part(part_fd):
+    fd, target = part_fd
+    session = range_session([b"part ", b"of file"])
     results = [None] * 2
-    download_file_part("http://example.com", 0, 10, "dummy_file", 0, results)
-    assert results[0] == b"part of file"
+    download_file_part(session, "http://example.com", 5, 16, fd, 1, results, threading.Event())
+    assert results[1] == 12
+    assert target.read_bytes() == b"\0" * 5 + b"part of file" + b"\0" * 3
+    session.get.assert_called_with("http://example.com", headers={"Range": "bytes=5-16"},
+                                   stream=True, timeout=10)
+
+
+@patch("tools.net.MIN_PART_SIZE", 12)
+def test_download_file(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    fake_server()
+    download_file("http://example.com", str(target), num_threads=2)
+    assert target.read_bytes() == b"part of file" * 2
 
 
-@patch("requests.head")
-@patch("requests.get")
-def test_download_file(mock_get, mock_head):
-    mock_head.return_value = MagicMock(headers={"content-length": "20"})
-    mock_response = MagicMock()
-    mock_response.content = b"part of file"
-    mock_get.return_value = mock_response
-    with patch("builtins.open", mock_open()) as mock_file:
-        download_file("http://example.com", "dummy_file", num_threads=2)
-        mock_file().write.assert_called()
+@patch("tools.net.MIN_PART_SIZE", 12)
+def test_download_file_part_error(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    fake_server().side_effect = requests.ConnectionError("connection reset")
+    with pytest.raises(requests.ConnectionError):
+        download_file("http://example.com", str(target), num_threads=2)
+    assert not target.exists()
 
 
+@patch("tools.net.platform", "win32")
 @patch("subprocess.run")
 def test_install_software(mock_run):
+    mock_run.return_value.returncode = 0
     install_software("dummy_installer")
-    mock_run.assert_called_with(
-        ["start", "dummy_installer"], shell=True, check=True)
+    mock_run.assert_called_with(["dummy_installer"], check=False)
 
 
+@patch("tools.net.platform", "win32")
 @patch("subprocess.run")
-def test_uninstall_dotnet(mock_run):
-    mock_run.return_value = MagicMock(returncode=0)
-    uninstall_dotnet("v4\\Client")
+def test_install_software_msi(mock_run):
+    mock_run.return_value.returncode = 0
+    install_software("dotnet.msi")
     mock_run.assert_called_with(
-        ["reg", "delete", "HKLM\\SOFTWARE\\Microsoft\\NET Framework Setup\\NDP\\v4\\Client", "/f"], capture_output=True, text=True, check=True)
+        ["msiexec", "/i", "dotnet.msi", "/quiet", "/norestart"], check=False)
+
+
+@patch("tools.net.platform", "win32")
+@patch("subprocess.run")
+def test_install_software_reboot_required(mock_run):
+    mock_run.return_value.returncode = 3010
+    with patch("builtins.print") as mock_print:
+        install_software("dotnet.msi")
+    assert "reboot is pending" in mock_print.call_args.args[0]
+
+
+@patch("tools.net.platform", "win32")
+@patch("subprocess.run")
+def test_install_software_failure(mock_run):
+    mock_run.return_value.returncode = 1603
+    with pytest.raises(subprocess.CalledProcessError):
+        install_software("dotnet.msi")
+
+
+@patch("tools.net.platform", "linux")
+@patch("subprocess.run")
+def test_install_software_not_windows(mock_run):
+    install_software("dummy_installer")
+    mock_run.assert_not_called()
+
+
+def test_uninstall_dotnet(fake_winreg):
+    assert check_dotnet_installed("v4") == True
+    with patch("builtins.print") as mock_print:
+        uninstall_dotnet("v4")
+        mock_print.assert_called_with(".NET Framework v4 uninstalled successfully.")
+    assert check_dotnet_installed("v4") == False
+    assert check_dotnet_installed("v4\\Client") == False
+
+
+def test_uninstall_dotnet_missing_version(fake_winreg):
+    with patch("builtins.print") as mock_print:
+        uninstall_dotnet("v1.1")
+        mock_print.assert_called_with("Failed to uninstall .NET Framework v1.1.")
+
+
+def test_run_batch(fake_winreg):
+    with patch("builtins.print") as mock_print:
+        results = run_batch([
+            ("list", None),
+            ("check", "v4\\Full"),
+            ("uninstall", "v4\\Full"),
+            ("check", "v4\\Full"),
+            ("uninstall", "v1.1"),
+        ])
+        mock_print.assert_any_call(".NET Framework v4\\Full is already installed.")
+        mock_print.assert_any_call(".NET Framework v4\\Full is not installed.")
+    assert results == [None, True, True, False, False]
+
+
+def test_run_batch_unknown_operation(fake_winreg):
+    with pytest.raises(ValueError):
+        run_batch([("repair", "v4")])
+
+
+@patch("tools.net.verify_file_checksum")
+@patch("tools.net.MIN_PART_SIZE", 12)
+def test_download_file_checksum_streamed(mock_verify, fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    fake_server()
+    checksum = hashlib.sha256(b"part of file" * 2).hexdigest()
+    download_file("http://example.com", str(target),
+                  num_threads=2, expected_checksum=checksum)
+    mock_verify.assert_not_called()
+
+
+@patch("tools.net.MIN_PART_SIZE", 12)
+def test_download_file_checksum_mismatch(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    fake_server()
+    with pytest.raises(ValueError):
+        download_file("http://example.com", str(target),
+                      num_threads=2, expected_checksum="0" * 64)
+    assert not target.exists()
+
+
+def test_download_file_without_range_support(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    mock_get = fake_server(headers={"content-length": "24"}, status=200,
+                           chunks=[b"part of file", b"part of file"],
+                           url="http://example.com/redirected")
+    checksum = hashlib.sha256(b"part of file" * 2).hexdigest()
+    download_file("http://example.com", str(target),
+                  num_threads=4, expected_checksum=checksum)
+    mock_get.assert_called_once_with("http://example.com/redirected", stream=True, timeout=10)
+    assert target.read_bytes() == b"part of file" * 2
+
+
+def test_download_file_part_ignored_range(part_fd):
+    fd, target = part_fd
+    results = [None] * 2
+    abort = threading.Event()
+    download_file_part(range_session(status=200), "http://example.com", 5, 16, fd, 1,
+                       results, abort)
+    assert isinstance(results[1], RangeNotSupportedError)
+    assert abort.is_set()
+    assert target.read_bytes() == b"\0" * 20
+
+
+@pytest.mark.parametrize("chunks", [[b"part "], [b"part of file", b"!"]], ids=["short", "long"])
+def test_download_file_part_wrong_length(part_fd, chunks):
+    fd, target = part_fd
+    results = [None] * 2
+    abort = threading.Event()
+    download_file_part(range_session(chunks), "http://example.com", 5, 16, fd, 1, results, abort)
+    assert isinstance(results[1], requests.RequestException)
+    assert abort.is_set()
+    assert target.read_bytes()[17:] == b"\0" * 3
+
+
+@patch("tools.net.MIN_PART_SIZE", 12)
+def test_download_file_falls_back_when_range_ignored(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    mock_get = fake_server(status=200, chunks=[b"part of file", b"part of file"])
+    checksum = hashlib.sha256(b"part of file" * 2).hexdigest()
+    download_file("http://example.com", str(target),
+                  num_threads=2, expected_checksum=checksum)
+    mock_get.assert_called_with("http://example.com", stream=True, timeout=10)
+    assert target.read_bytes() == b"part of file" * 2
+
+
+def test_download_file_small_file_single_request(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    mock_get = fake_server(status=200, chunks=[b"part of file" * 2])
+    download_file("http://example.com", str(target), num_threads=4)
+    mock_get.assert_called_once_with("http://example.com", stream=True, timeout=10)
+    assert target.read_bytes() == b"part of file" * 2
+
+
+@patch("tools.net.MIN_PART_SIZE", 4)
+@patch("tools.net.MAX_PARTS", 3)
+def test_download_file_caps_part_count(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    mock_get = fake_server(chunks=[b"part of "])
+    download_file("http://example.com", str(target), num_threads=8)
+    assert mock_get.call_count == 3
+    assert target.read_bytes() == b"part of " * 3
+
+
+@patch("tools.net.MIN_PART_SIZE", 4)
+def test_download_file_bounds_concurrency(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    mock_get = fake_server()
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def release():
+        with lock:
+            active[0] -= 1
+
+    def get(*args, **kwargs):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.01)
+        response = range_session([b"part"]).get.return_value
+        response.close.side_effect = release
+        return response
+
+    mock_get.side_effect = get
+    download_file("http://example.com", str(target), num_threads=2)
+    assert mock_get.call_count == 6
+    assert active[1] <= 2
+    assert target.read_bytes() == b"part" * 6
+
+
+def test_hash_file_range_reuses_buffer(tmp_path):
+    target = tmp_path / "dummy_file"
+    target.write_bytes(b"0123456789")
+    _hash = hashlib.sha256()
+    buffer = memoryview(bytearray(3))
+    with open(target, "rb", buffering=0) as f:
+        _hash_file_range(f, 2, 7, _hash, buffer)
+    assert _hash.hexdigest() == hashlib.sha256(b"2345678").hexdigest()
+
+
+def test_download_file_part_hashes_inline(part_fd):
+    fd, _ = part_fd
+    _hash = hashlib.sha256()
+    download_file_part(range_session([b"part ", b"of file"]), "http://example.com", 0, 11, fd, 0,
+                       [None], threading.Event(), _hash)
+    assert _hash.hexdigest() == hashlib.sha256(b"part of file").hexdigest()
+
+
+def test_download_file_skips_verified_copy(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    target.write_bytes(b"part of file")
+    mock_get = fake_server(headers={"content-length": "12"})
+    checksum = hashlib.sha256(b"part of file").hexdigest()
+    download_file("http://example.com", str(target), expected_checksum=checksum)
+    mock_get.assert_not_called()
+    assert target.read_bytes() == b"part of file"
+
+
+@patch("requests.Session.head", side_effect=requests.ConnectionError("offline"))
+def test_download_file_skips_verified_copy_offline(mock_head, tmp_path):
+    target = tmp_path / "dummy_file"
+    target.write_bytes(b"part of file")
+    checksum = hashlib.sha256(b"part of file").hexdigest()
+    download_file("http://example.com", str(target), expected_checksum=checksum)
+    assert target.read_bytes() == b"part of file"
+
+
+@patch("requests.Session.head", side_effect=requests.ConnectionError("offline"))
+def test_download_file_stale_copy_offline(mock_head, tmp_path):
+    target = tmp_path / "dummy_file"
+    target.write_bytes(b"stale")
+    checksum = hashlib.sha256(b"part of file").hexdigest()
+    with pytest.raises(requests.ConnectionError):
+        download_file("http://example.com", str(target), expected_checksum=checksum)
+
+
+def test_download_file_force_redownloads(fake_server, tmp_path):
+    target = tmp_path / "dummy_file"
+    target.write_bytes(b"part of file")
+    mock_get = fake_server(headers={"content-length": "12"}, status=200)
+    checksum = hashlib.sha256(b"part of file").hexdigest()
+    download_file("http://example.com", str(target), expected_checksum=checksum, force=True)
+    mock_get.assert_called_once()
+
+
+def test_parse_arguments():
+    parser, args = parse_arguments(["--check", "v4\\Client", "--threads", "8", "--force"])
+    assert args.check == "v4\\Client"
+    assert args.threads == 8
+    assert args.force == True
+    assert "--hash-algo" in parser.format_help()
+
+
+@patch("tools.net.run_batch")
+def test_main_without_action_prints_help(mock_run_batch, capsys):
+    with patch("sys.argv", ["net.py"]):
+        main()
+    assert "--uninstall" in capsys.readouterr().out
+    mock_run_batch.assert_not_called()
@@ -12,11 +12,13 @@
                 python net_framework_installer.py --list
                 python net_framework_installer.py --check v4.0.30319
                 python net_framework_installer.py --check v4.0.30319 --download [URL] --install [FILE_PATH] --threads 4 --checksum [SHA256]
+                python net_framework_installer.py --check v4.0.30319 --download [URL] --install [FILE_PATH] --checksum [DIGEST] --hash-algo blake3
                 python net_framework_installer.py --uninstall v4.0.30319
 
 @requires     - Python 3.x
               - Windows operating system
               - `requests` Python library
+              - Optional: `blake3` or `xxhash` for the faster checksum algorithms
 
 @note         This script must be run with administrative privileges to install or uninstall .NET Framework versions.
 
@@ -25,47 +27,221 @@
 """
 
 import argparse
+import functools
 import hashlib
+import importlib
+import mmap
 import subprocess
 import threading
 import os
+from concurrent.futures import ThreadPoolExecutor
 from sys import platform
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import winreg
+except ImportError:  # winreg is only available on Windows
+    winreg = None
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB reads keep per-chunk Python overhead negligible
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB network reads written straight to disk
+MIN_PART_SIZE = 8 * 1024 * 1024  # smaller ranges are not worth an extra request
+MAX_PARTS = 16  # upper bound on the number of byte ranges per download
+NDP_REGISTRY_KEY = "SOFTWARE\\Microsoft\\NET Framework Setup\\NDP"
+# Installer exit codes for a successful install that still needs a reboot:
+# ERROR_SUCCESS_REBOOT_INITIATED and ERROR_SUCCESS_REBOOT_REQUIRED
+REBOOT_EXIT_CODES = (1641, 3010)
+
+# Faster non-cryptographic/SIMD digests, usable when their packages are installed:
+# algorithm name -> (module, constructor attribute)
+OPTIONAL_HASH_ALGORITHMS = {
+    'blake3': ('blake3', 'blake3'),
+    'xxh128': ('xxhash', 'xxh128'),
+}
+
+
+if hasattr(os, 'pwrite'):
+    _pwrite = os.pwrite
+else:  # Windows has no positioned write, so serialize seek + write on the shared descriptor
+    _pwrite_lock = threading.Lock()
+
+    def _pwrite(fd, data, offset):
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.write(fd, data)
+
+
+class RangeNotSupportedError(requests.RequestException):
+    """Raised when a server answers a byte-range request with the full content."""
+
+
+def _hash_constructor(hash_algo):
+    """
+    Resolve a hash algorithm name to a zero-argument constructor.
+
+    Names in OPTIONAL_HASH_ALGORITHMS are imported lazily from their third-party
+    package; every other name is passed to hashlib.new.
+
+    @param hash_algo        The name of the hashing algorithm.
+
+    @return A callable returning a new hash object.
+    @throws ValueError if an optional algorithm's package is not installed.
+    """
+    if hash_algo in OPTIONAL_HASH_ALGORITHMS:
+        module_name, constructor = OPTIONAL_HASH_ALGORITHMS[hash_algo]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as exc:
+            raise ValueError(
+                f"Hash algorithm '{hash_algo}' requires the '{module_name}' package") from exc
+        return getattr(module, constructor)
+    return functools.partial(hashlib.new, hash_algo)
+
+
+def _digest_mapped(f, new_hash):
+    """
+    Hash a whole file through a read-only memory map with a single update call.
+
+    @param f                A file object opened for binary reading.
+    @param new_hash         A callable returning a new hash object.
+
+    @return The updated hash object.
+    @throws ValueError, OSError or OverflowError if the file cannot be mapped.
+    """
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):  # Unix only, Python 3.8+
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        _hash = new_hash()
+        _hash.update(mapped)
+    return _hash
 
 
 def verify_file_checksum(file_path, original_checksum, hash_algo='sha256'):
     """
     Verify the file checksum.
 
+    The file is memory-mapped and hashed in one update call, so no data is copied
+    through Python-level buffers. Files that cannot be mapped (empty files, or
+    files too large for the address space) are hashed with hashlib.file_digest on
+    Python 3.11+, or with a chunked read loop on older versions.
+
     @param file_path        The path to the file whose checksum is to be verified.
     @param original_checksum The expected checksum to verify against.
-    @param hash_algo        The hashing algorithm to use (default is SHA-256).
+    @param hash_algo        The hashing algorithm to use (default is SHA-256); 'blake3' and
+                            'xxh128' are available when their packages are installed.
 
     @return True if the checksum matches, False otherwise.
     """
-    _hash = hashlib.new(hash_algo)
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            _hash.update(chunk)
+    new_hash = _hash_constructor(hash_algo)
+    # Unbuffered: neither mmap nor file_digest benefit from a BufferedReader.
+    with open(file_path, 'rb', buffering=0) as f:
+        try:
+            _hash = _digest_mapped(f, new_hash)
+        except (ValueError, OSError, OverflowError):
+            f.seek(0)
+            if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                _hash = hashlib.file_digest(f, new_hash)
+            else:
+                _hash = new_hash()
+                read, update = f.read, _hash.update
+                while chunk := read(HASH_CHUNK_SIZE):
+                    update(chunk)
     return _hash.hexdigest() == original_checksum
 
 
+def _read_registry_tree(handle, path, snapshot):
+    """
+    Recursively collects the values of an open registry key and all of its subkeys.
+
+    Subkeys that cannot be opened (e.g. access denied) are recorded without values
+    or children instead of failing the whole walk.
+
+    @param handle:   An open winreg key handle.
+    @param path:     The path of the key relative to NDP (empty for the NDP key itself).
+    @param snapshot: The dict that receives a {path: properties} entry for every subkey.
+    """
+    index = 0
+    while True:
+        try:
+            name = winreg.EnumKey(handle, index)
+        except OSError:
+            break
+        index += 1
+        subpath = f"{path}\\{name}" if path else name
+        properties = snapshot.setdefault(subpath, {})
+        try:
+            subkey = winreg.OpenKey(handle, name)
+        except OSError:
+            continue
+        with subkey:
+            value_index = 0
+            while True:
+                try:
+                    value_name, value, _ = winreg.EnumValue(subkey, value_index)
+                except OSError:
+                    break
+                value_index += 1
+                properties[value_name] = value
+            _read_registry_tree(subkey, subpath, snapshot)
+
+
+@functools.lru_cache(maxsize=1)
+def _registry_snapshot():
+    """
+    Reads the whole NDP registry subtree through the in-process winreg API.
+
+    The result is cached for the lifetime of the process so that repeated version
+    checks are answered from memory.
+
+    @return: A dict mapping each version key below NDP (e.g. 'v4\\Client') to a dict of
+             its registry values, or an empty dict if the key could not be read.
+    """
+    if winreg is None:
+        return {}
+    snapshot = {}
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, NDP_REGISTRY_KEY) as handle:
+            _read_registry_tree(handle, "", snapshot)
+    except OSError:
+        return {}
+    return snapshot
+
+
+def _delete_registry_tree(parent, name):
+    """
+    Deletes a registry key together with all of its subkeys.
+
+    winreg.DeleteKey refuses to remove keys that still have children, so the
+    subkeys are removed depth-first before the key itself.
+
+    @param parent: An open winreg key handle that contains the key to delete.
+    @param name:   The name of the key to delete, relative to parent.
+    """
+    with winreg.OpenKey(parent, name, 0, winreg.KEY_ALL_ACCESS) as handle:
+        while True:
+            try:
+                child = winreg.EnumKey(handle, 0)
+            except OSError:
+                break
+            _delete_registry_tree(handle, child)
+    winreg.DeleteKey(parent, name)
+
+
 def check_dotnet_installed(version):
     """
     Checks if a specific version of the .NET Framework is installed by querying the Windows Registry.
 
+    Like the registry itself, the comparison is case-insensitive.
+
     @param version: A string representing the .NET Framework version to check (e.g., 'v4\\Client').
     @return: True if the specified version is installed, False otherwise.
     """
-    try:
-        result = subprocess.run(
-            ["reg", "query", f"HKLM\\SOFTWARE\\Microsoft\\NET Framework Setup\\NDP\\{
-                version}"],
-            capture_output=True, text=True, check=True
-        )
-        return result.returncode == 0 and version in result.stdout
-    except subprocess.CalledProcessError:
-        return False
+    snapshot = _registry_snapshot()
+    if version in snapshot:
+        return True
+    folded = version.casefold()
+    return any(key.casefold() == folded for key in snapshot)
 
 
 def list_installed_dotnets():
@@ -74,72 +250,273 @@ def list_installed_dotnets():
 
     Prints each found version directly to the standard output.
     """
-    try:
-        result = subprocess.run(
-            ["reg", "query", "HKLM\\SOFTWARE\\Microsoft\\NET Framework Setup\\NDP\\"],
-            capture_output=True, text=True, check=True
-        )
-        if result.returncode == 0:
-            print("Installed .NET Framework versions:")
-            for line in result.stdout.splitlines():
-                if "v" in line:
-                    print(line.strip())
-    except subprocess.CalledProcessError:
+    snapshot = _registry_snapshot()
+    if not snapshot:
         print("Failed to query the registry for installed .NET Framework versions.")
+        return
+    print("Installed .NET Framework versions:")
+    # The snapshot holds the whole NDP tree; only its direct children are versions.
+    for version in snapshot:
+        if version.startswith("v") and "\\" not in version:
+            print(version)
 
 
-def download_file_part(url, start, end, filename, idx, results):
+def download_file_part(session, url, start, end, fd, idx, results, abort, _hash=None):
     """
-    Download a part of a file specified by byte range.
+    Download a part of a file specified by byte range and write it in place.
+
+    The data is streamed with positioned writes to its final offset in the
+    (pre-allocated) output file as it arrives, so a part is never held in memory
+    as a whole and all parts share a single file descriptor. A response other than
+    206 Partial Content means the server ignored the range, so the part is rejected
+    with RangeNotSupportedError instead of writing the whole file at this offset.
+    A body shorter or longer than the requested range is rejected as well, since it
+    would leave a hole in the file or overwrite the next part.
 
+    @param session          The shared requests session whose connection pool is reused.
     @param url              The URL from which to download the file.
     @param start            The starting byte of the file part.
     @param end              The ending byte of the file part.
-    @param filename         The filename where the downloaded data will be temporarily stored.
+    @param fd               The OS-level file descriptor of the pre-allocated output file.
     @param idx              The index of the thread (used for storing results in the correct order).
-    @param results          A shared list to store results from each thread.
+    @param results          A shared list receiving the number of bytes written by each thread,
+                            or the exception that stopped it.
+    @param abort            A threading.Event set by the first failing part; the other parts stop
+                            downloading once it is set.
+    @param _hash            Optional; a hash object updated with every chunk as it is written.
+                            Only valid for the part that comes first in file order.
     """
+    if abort.is_set():
+        results[idx] = 0
+        return
     headers = {'Range': f'bytes={start}-{end}'}
-    response = requests.get(url, headers=headers, stream=True, timeout=10)
-    response.raise_for_status()
-    results[idx] = response.content
+    try:
+        response = session.get(url, headers=headers, stream=True, timeout=10)
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RangeNotSupportedError(
+                    f"Range request answered with status {response.status_code}")
+            length = end - start + 1
+            written = 0
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                if abort.is_set():
+                    break
+                if written + len(chunk) > length:
+                    raise requests.RequestException(
+                        f"Range {start}-{end} answered with more than {length} bytes")
+                if _hash is not None:
+                    _hash.update(chunk)
+                view = memoryview(chunk)
+                while view:
+                    count = _pwrite(fd, view, start + written)
+                    view = view[count:]
+                    written += count
+            else:
+                if written != length:
+                    raise requests.RequestException(
+                        f"Range {start}-{end} answered with {written} of {length} bytes")
+        finally:
+            response.close()
+        results[idx] = written
+    except (requests.RequestException, OSError) as exc:
+        results[idx] = exc
+        abort.set()
+
+
+def _download_part_bounded(semaphore, *args):
+    """
+    Run download_file_part while holding one slot of a concurrency semaphore.
+
+    @param semaphore        The threading.Semaphore limiting concurrent range requests.
+    @param args             The arguments forwarded to download_file_part.
+    """
+    with semaphore:
+        download_file_part(*args)
 
 
-def download_file(url, filename, num_threads=4, expected_checksum=None):
+def _hash_file_range(f, start, length, _hash, buffer):
     """
-    Download a file using multiple threads and optionally verify its checksum.
+    Feed a byte range of an open file into a hash object.
+
+    The data is read into a caller-provided buffer that is reused for every
+    range, instead of allocating a new bytes object for each read.
+
+    @param f                A file object opened for binary reading.
+    @param start            The offset of the first byte to hash.
+    @param length           The number of bytes to hash.
+    @param _hash            The hash object to update.
+    @param buffer           A memoryview over a writable buffer used for the reads.
+    """
+    f.seek(start)
+    while length > 0:
+        count = f.readinto(buffer[:min(len(buffer), length)])
+        if not count:
+            break
+        _hash.update(buffer[:count])
+        length -= count
+
 
+def _download_single(session, url, filename, _hash):
+    """
+    Download a file with one streaming GET, hashing the data as it is written.
+
+    Used when the server does not support byte-range requests.
+
+    @param session          The requests session to use.
     @param url              The URL from which to download the file.
     @param filename         The filename where the downloaded file will be saved.
-    @param num_threads      The number of threads to use for downloading the file.
-    @param expected_checksum Optional; the expected checksum of the downloaded file for verification purposes.
+    @param _hash            Optional; a hash object updated with every chunk written.
+    """
+    response = session.get(url, stream=True, timeout=10)
+    response.raise_for_status()
+    with open(filename, 'wb') as f:
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            if _hash is not None:
+                _hash.update(chunk)
 
-    @return None
+
+def _download_parts(session, url, filename, total_size, num_parts, max_concurrency, _hash):
     """
-    response = requests.head(url, timeout=10)
-    total_size = int(response.headers.get('content-length', 0))
-    part_size = total_size // num_threads
-    results = [None] * num_threads
+    Download a file as concurrent byte ranges written directly into place.
+
+    At most max_concurrency ranges are requested at the same time; the others
+    wait for a free slot, so memory and open connections stay bounded no matter
+    how many ranges the file is split into. All parts write through one shared
+    file descriptor with positioned writes.
+
+    The checksum is computed in file order while the download is still in
+    progress. The first range is hashed as its chunks arrive; every later range
+    is hashed from the page cache as soon as it and all ranges before it are
+    complete, overlapping with the parts that are still being fetched.
 
+    @param session          The requests session shared by all part threads.
+    @param url              The URL from which to download the file.
+    @param filename         The filename where the downloaded file will be saved.
+    @param total_size       The size of the file in bytes.
+    @param num_parts        The number of byte ranges to split the file into.
+    @param max_concurrency  The maximum number of ranges downloaded at the same time.
+    @param _hash            Optional; a hash object updated with the file contents in order.
+    """
+    part_size = total_size // num_parts
+    results = [None] * num_parts
+    abort = threading.Event()
+    semaphore = threading.Semaphore(max_concurrency)
     threads = []
-    for i in range(num_threads):
-        start = i * part_size
-        end = start + part_size - 1 if i < num_threads - 1 else total_size - 1
-        args = (url, start, end, filename, i, results)
-        thread = threading.Thread(target=download_file_part, args=args)
-        threads.append(thread)
-        thread.start()
+    ranges = []
 
-    for thread in threads:
-        thread.join()
+    flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(filename, flags)
+    try:
+        os.ftruncate(fd, total_size)
+        for i in range(num_parts):
+            start = i * part_size
+            end = start + part_size - 1 if i < num_parts - 1 else total_size - 1
+            ranges.append((start, end))
+            args = (semaphore, session, url, start, end, fd, i, results, abort,
+                    _hash if i == 0 else None)
+            thread = threading.Thread(target=_download_part_bounded, args=args)
+            threads.append(thread)
+            thread.start()
+
+        buffer = memoryview(bytearray(HASH_CHUNK_SIZE)) if _hash is not None else None
+        # Unbuffered, so read-ahead never serves bytes of a part that is still being written.
+        with open(filename, 'rb', buffering=0) as f:
+            for i, thread in enumerate(threads):
+                thread.join()
+                if abort.is_set():
+                    break
+                if _hash is not None and i > 0:
+                    start, end = ranges[i]
+                    _hash_file_range(f, start, end - start + 1, _hash, buffer)
+    finally:
+        # Stop any part still running before its file descriptor goes away.
+        abort.set()
+        for thread in threads:
+            thread.join()
+        os.close(fd)
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        range_errors = [e for e in errors if isinstance(e, RangeNotSupportedError)]
+        raise range_errors[0] if range_errors else errors[0]
+
+
+def download_file(url, filename, num_threads=4, expected_checksum=None, hash_algo='sha256',
+                  force=False):
+    """
+    Download a file using multiple threads and optionally verify its checksum.
 
-    with open(filename, 'wb') as f:
-        for content in results:
-            f.write(content)
+    All requests share one pooled session, so the byte-range requests reuse
+    kept-alive connections and the redirect target resolved by the initial HEAD
+    request. Servers that do not advertise `Accept-Ranges: bytes`, or that answer
+    a range request with the full content, are downloaded with a single streaming
+    request instead. The number of ranges follows the file size: every range is
+    at least MIN_PART_SIZE bytes and there are never more than MAX_PARTS of them.
+    The checksum is computed while the file is downloaded, so the file does not
+    have to be read back afterwards. If filename already exists and matches
+    expected_checksum, nothing is downloaded; that check runs on a worker thread
+    concurrently with the initial HEAD request.
+
+    @param url              The URL from which to download the file.
+    @param filename         The filename where the downloaded file will be saved.
+    @param num_threads      The maximum number of ranges downloaded concurrently; values below 2
+                            disable splitting the download into ranges.
+    @param expected_checksum Optional; the expected checksum of the downloaded file for verification purposes.
+    @param hash_algo        The hashing algorithm to use for verification (default is SHA-256);
+                            see verify_file_checksum for the optional faster algorithms.
+    @param force            If True, download even when a verified copy of the file already exists.
+
+    @return None
+    """
+    cached_copy = None
+    if not force and expected_checksum and os.path.isfile(filename):
+        # Verify the existing copy on a worker thread while the HEAD request is in flight.
+        verifier = ThreadPoolExecutor(max_workers=1)
+        cached_copy = verifier.submit(verify_file_checksum, filename, expected_checksum, hash_algo)
+        verifier.shutdown(wait=False)
+
+    new_hash = _hash_constructor(hash_algo)
+    _hash = new_hash() if expected_checksum else None
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(num_threads, 1))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        try:
+            response = session.head(url, allow_redirects=True, timeout=10)
+            response.raise_for_status()
+        except requests.RequestException:
+            if cached_copy is None or not cached_copy.result():
+                raise
+        if cached_copy is not None and cached_copy.result():
+            print(f"{filename} already exists and matches the checksum, skipping download.")
+            return
+        url = response.url
+        total_size = int(response.headers.get('content-length', 0))
+        accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        num_parts = max(1, min(MAX_PARTS, total_size // MIN_PART_SIZE))
+
+        try:
+            if accepts_ranges and num_parts > 1 and num_threads > 1:
+                try:
+                    _download_parts(session, url, filename, total_size, num_parts,
+                                    num_threads, _hash)
+                except RangeNotSupportedError:
+                    print("Server ignored the range request, falling back to a single download.")
+                    _hash = new_hash() if expected_checksum else None
+                    _download_single(session, url, filename, _hash)
+            else:
+                _download_single(session, url, filename, _hash)
+        except (requests.RequestException, OSError):
+            if os.path.exists(filename):
+                os.remove(filename)
+            raise
 
     print(f"Downloaded {filename}")
     if expected_checksum:
-        if verify_file_checksum(filename, expected_checksum):
+        if _hash.hexdigest() == expected_checksum:
             print("File checksum verified successfully.")
         else:
             print("File checksum verification failed.")
@@ -149,40 +526,121 @@ def download_file(url, filename, num_threads=4, expected_checksum=None):
 
 def install_software(installer_path):
     """
-    Executes a software installer from a specified path.
+    Executes a software installer from a specified path and waits for it to finish.
+
+    The installer is started directly rather than through `cmd.exe /c start`;
+    Windows Installer packages (.msi) are run unattended through msiexec.
+    Exit codes in REBOOT_EXIT_CODES count as success with a pending reboot.
 
-    @param installer_path: The path to the executable installer file.
+    @param installer_path: The path to the executable or .msi installer file.
+    @raises subprocess.CalledProcessError: If the installer exits with any other non-zero code.
     """
     if platform == "win32":  # Ensure this is run on Windows
-        subprocess.run(["start", installer_path], shell=True, check=True)
-        print(f"Installer {installer_path} started.")
+        installer_path = str(installer_path)
+        if installer_path.lower().endswith(".msi"):
+            command = ["msiexec", "/i", installer_path, "/quiet", "/norestart"]
+        else:
+            command = [installer_path]
+        result = subprocess.run(command, check=False)
+        if result.returncode in REBOOT_EXIT_CODES:
+            print(f"Installer {installer_path} finished; a reboot is pending to complete the installation.")
+        elif result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command)
+        else:
+            print(f"Installer {installer_path} finished.")
     else:
         print("This script only supports Windows.")
 
 
-def uninstall_dotnet(version):
+def _uninstall_version(handle, version):
     """
-    Uninstall a specific version of the .NET Framework.
+    Removes the registry key of one .NET Framework version below an open NDP key.
 
+    @param handle:  The NDP key opened with KEY_ALL_ACCESS, or None if it could not be opened.
     @param version: A string representing the .NET Framework version to uninstall (e.g., 'v4\\Client').
+    @return: True if the version was removed, False otherwise.
     """
     try:
-        result = subprocess.run(
-            ["reg", "delete", f"HKLM\\SOFTWARE\\Microsoft\\NET Framework Setup\\NDP\\{
-                version}", "/f"],
-            capture_output=True, text=True, check=True
-        )
-        if result.returncode == 0:
-            print(f".NET Framework {version} uninstalled successfully.")
-        else:
-            print(f"Failed to uninstall .NET Framework {version}.")
-    except subprocess.CalledProcessError:
+        if handle is None:
+            raise OSError("The NDP registry key is not accessible")
+        _delete_registry_tree(handle, version)
+    except OSError:
         print(f"Failed to uninstall .NET Framework {version}.")
+        return False
+    finally:
+        _registry_snapshot.cache_clear()
+    print(f".NET Framework {version} uninstalled successfully.")
+    return True
 
 
-def main():
+def _open_ndp_key_for_write():
     """
-    Main function to parse command-line arguments and invoke script functionality.
+    Opens the NDP registry key with write access.
+
+    @return: The open key handle, or None if winreg is unavailable or the key cannot be opened.
+    """
+    if winreg is None:
+        return None
+    try:
+        return winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, NDP_REGISTRY_KEY, 0,
+                              winreg.KEY_ALL_ACCESS)
+    except OSError:
+        return None
+
+
+def run_batch(ops):
+    """
+    Runs several .NET Framework registry operations in a single pass.
+
+    Checks and listings are answered from the shared registry snapshot, and the
+    NDP key is opened for writing only once, however many versions are uninstalled.
+
+    @param ops: A list of (operation, version) tuples, where operation is 'list', 'check'
+                or 'uninstall'. The version is ignored for 'list'.
+    @return: A list with one entry per operation: whether the version is installed for
+             'check', whether it was removed for 'uninstall', and None for 'list'.
+    """
+    results = []
+    write_handle = None
+    try:
+        for operation, version in ops:
+            if operation == "list":
+                list_installed_dotnets()
+                results.append(None)
+            elif operation == "check":
+                installed = check_dotnet_installed(version)
+                if installed:
+                    print(f".NET Framework {version} is already installed.")
+                else:
+                    print(f".NET Framework {version} is not installed.")
+                results.append(installed)
+            elif operation == "uninstall":
+                if write_handle is None:
+                    write_handle = _open_ndp_key_for_write()
+                results.append(_uninstall_version(write_handle, version))
+            else:
+                raise ValueError(f"Unknown operation: {operation}")
+    finally:
+        if write_handle is not None:
+            write_handle.Close()
+    return results
+
+
+def uninstall_dotnet(version):
+    """
+    Uninstall a specific version of the .NET Framework.
+
+    @param version: A string representing the .NET Framework version to uninstall (e.g., 'v4\\Client').
+    """
+    run_batch([("uninstall", version)])
+
+
+def parse_arguments(argv=None):
+    """
+    Builds the command-line parser and parses the arguments.
+
+    @param argv: The arguments to parse; defaults to sys.argv[1:].
+    @return: A (parser, args) tuple, so callers can reuse the parser for help output.
     """
     parser = argparse.ArgumentParser(
         description="Check and install .NET Framework versions.")
@@ -196,28 +654,46 @@ def main():
                         help="Path to the .NET Framework installer to run.")
     parser.add_argument("--threads", type=int, default=4,
                         help="Number of threads to use for downloading.")
-    parser.add_argument("--checksum", metavar="SHA256",
-                        help="Expected SHA256 checksum of the downloaded file.")
+    parser.add_argument("--checksum", metavar="DIGEST",
+                        help="Expected checksum of the downloaded file.")
+    parser.add_argument("--hash-algo", default="sha256",
+                        help="Checksum algorithm, e.g. sha256 (default), md5, or the faster "
+                             "blake3/xxh128 when their packages are installed.")
+    parser.add_argument("--force", action="store_true",
+                        help="Download the installer even if a verified copy already exists.")
     parser.add_argument("--uninstall", metavar="VERSION",
                         help="Uninstall a specific .NET Framework version.")
 
-    args = parser.parse_args()
+    return parser, parser.parse_args(argv)
 
-    if args.list:
-        list_installed_dotnets()
 
-    if args.check:
-        if check_dotnet_installed(args.check):
-            print(f".NET Framework {args.check} is already installed.")
-        else:
-            print(f".NET Framework {args.check} is not installed.")
-            if args.download and args.install:
-                download_file(args.download, args.install,
-                              num_threads=args.threads, expected_checksum=args.checksum)
-                install_software(args.install)
+def main():
+    """
+    Main function to parse command-line arguments and invoke script functionality.
 
+    The requested registry operations are collected first and executed together
+    with run_batch. Without any action, the usage help is printed.
+    """
+    parser, args = parse_arguments()
+    if not (args.list or args.check or args.uninstall):
+        parser.print_help()
+        return
+
+    ops = []
+    if args.list:
+        ops.append(("list", None))
+    if args.check:
+        ops.append(("check", args.check))
     if args.uninstall:
-        uninstall_dotnet(args.uninstall)
+        ops.append(("uninstall", args.uninstall))
+    results = run_batch(ops)
+
+    if args.check and not results[ops.index(("check", args.check))]:
+        if args.download and args.install:
+            download_file(args.download, args.install, num_threads=args.threads,
+                          expected_checksum=args.checksum, hash_algo=args.hash_algo,
+                          force=args.force)
+            install_software(args.install)
 
 
 if __name__ == "__main__":
@@ -10,13 +10,105 @@ The script also includes a function to check if a given file is a Google Test bi
 Finally, the script provides a main function that takes a directory path as an argument and prints the list of test binaries.
 """
 import os
+import mmap
 import subprocess
+import asyncio
 import concurrent.futures
-import json
+import multiprocessing
 import argparse
-from datetime import datetime
+import tempfile
+from itertools import islice
+from operator import attrgetter
+from dataclasses import dataclass
+from typing import NamedTuple
+import time
+from datetime import datetime, timedelta
 import pytest
 
+try:
+    import json_stream
+    from json_stream.base import TransientAccessException
+    # json_stream reports missing or out-of-order keys with its own exception type.
+    _STREAM_ERRORS = (TransientAccessException,)
+except ImportError:  # optional: bounds memory while parsing large gtest reports
+    json_stream = None
+    _STREAM_ERRORS = ()
+
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:  # optional: faster decoding of whole gtest reports
+    from json import dumps as _json_dumps, loads as _loads
+
+    def _dumps(obj):
+        return _json_dumps(obj).encode('utf-8')
+
+# ELF, PE (MZ), and Mach-O 32/64-bit (both byte orders) and universal binaries.
+EXECUTABLE_MAGICS = (
+    b'\x7fELF', b'MZ',
+    b'\xfe\xed\xfa\xce', b'\xfe\xed\xfa\xcf', b'\xce\xfa\xed\xfe', b'\xcf\xfa\xed\xfe',
+    b'\xca\xfe\xba\xbe',
+)
+# Byte strings found in binaries linked against Google Test: the flag in gtest's
+# built-in help text, or the mangled `testing::` symbols (Itanium and MSVC) that
+# are present even when gtest is linked as a shared library.
+GTEST_SIGNATURES = (b'--gtest_list_tests', b'_ZN7testing', b'@testing@@')
+# Shared default for test cases without a "failures" list.
+_EMPTY = ()
+# Default location of the discovery cache and the most entries it keeps.
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'gtest-runner.json')
+CACHE_MAX_ENTRIES = 50_000
+# Reports at least this large are parsed with json_stream, when installed, to
+# bound memory; smaller ones are decoded in one go, which is much faster.
+STREAM_REPORT_SIZE = 64 * 1024 * 1024
+# Errors that mark a gtest report as malformed, whichever parser read it.
+REPORT_ERRORS = (ValueError, KeyError, TypeError, AttributeError) + _STREAM_ERRORS
+# Threads used to scan the top-level subdirectories of the test directory.
+SCAN_WORKERS = 16
+
+
+class GTestDetails(NamedTuple):
+    """
+    The outcomes of the test cases of one Google Test binary, stored column-wise:
+    entry `i` of each list belongs to the same test case.
+
+    Attributes:
+        names (list): The test names.
+        statuses (list): `FAILED` if any assertion failed, otherwise gtest's result.
+        times (list): The run times as reported by gtest.
+        failure_messages (list): The joined failure messages, or '' for passing tests.
+    """
+    names: list
+    statuses: list
+    times: list
+    failure_messages: list
+
+
+# Shared details of runs that produced no test report.
+_NO_DETAILS = GTestDetails((), (), (), ())
+
+
+@dataclass(slots=True)
+class BinResult:
+    """
+    The outcome of running one Google Test binary.
+
+    Attributes:
+        binary (str): Path to the test binary.
+        num_tests (int): Number of tests run.
+        num_failures (int): Number of failed tests.
+        failure_reasons (list): Failure messages, or why the run produced no report.
+        test_details (GTestDetails): The outcome of each test case.
+        start_time (datetime): When the run started.
+        duration_ns (int): How long the run took, in nanoseconds.
+    """
+    binary: str
+    num_tests: int
+    num_failures: int
+    failure_reasons: list
+    test_details: GTestDetails
+    start_time: datetime
+    duration_ns: int
+
 
 def is_test_binary(file_path):
     """
@@ -31,127 +123,482 @@ def is_test_binary(file_path):
     try:
         result = subprocess.run(
             [file_path, '--gtest_list_tests'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=False,
             timeout=10,
-            check=True
+            check=False
         )
-        return result.returncode == 0
-    except subprocess.CalledProcessError:
+    except (subprocess.TimeoutExpired, OSError):
         return False
-    except subprocess.TimeoutExpired:
+    return result.returncode == 0
+
+
+def _scan_files(directory):
+    """
+    Recursively yields the regular files below the given directory.
+
+    Uses `os.scandir` so that file types come from the directory listing itself
+    instead of a separate `stat` call per entry. Symlinks are not followed.
+
+    Args:
+        directory (str): The directory to scan.
+
+    Yields:
+        tuple: The path of each regular file and its `os.stat_result`.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scan_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+    except OSError:
+        return
+
+
+def _list_files(directory):
+    """
+    Returns the regular files below the given directory, as `_scan_files` yields them.
+
+    Args:
+        directory (str): The directory to scan.
+
+    Returns:
+        list: The path and `os.stat_result` of each regular file.
+    """
+    return list(_scan_files(directory))
+
+
+def _scan_tree(directory):
+    """
+    Yields the regular files below the given directory, scanning its top-level
+    subdirectories in parallel.
+
+    Directory reads are dominated by I/O latency on network filesystems and cold
+    caches, so each top-level subdirectory is walked by its own thread. Files
+    directly in `directory` come first, followed by each subdirectory in turn.
+
+    Args:
+        directory (str): The directory to scan.
+
+    Yields:
+        tuple: The path of each regular file and its `os.stat_result`.
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+    except OSError:
+        return
+    if len(subdirs) < 2:
+        for subdir in subdirs:
+            yield from _scan_files(subdir)
+        return
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(SCAN_WORKERS, len(subdirs))) as executor:
+        for files in executor.map(_list_files, subdirs):
+            yield from files
+
+
+def _looks_like_gtest(file_path):
+    """
+    Cheaply checks whether the given file can be a Google Test binary.
+
+    A native executable must contain one of the `GTEST_SIGNATURES`, which is
+    searched through a read-only memory map. Scripts starting with `#!` cannot be
+    judged by their content, since wrapper scripts (e.g. libtool's) launch the
+    real test binary, so they are always left to the `is_test_binary` probe.
+
+    Args:
+        file_path (str): Path to the file to check.
+
+    Returns:
+        bool: True if the file may be a Google Test binary, otherwise False.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            magic = f.read(4)
+            if magic.startswith(b'#!'):
+                return True
+            if not magic.startswith(EXECUTABLE_MAGICS):
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return any(mapped.find(signature) != -1 for signature in GTEST_SIGNATURES)
+    except (OSError, ValueError):
         return False
 
 
-def get_test_binaries(directory):
+def _probe_executor(max_workers):
+    """
+    Creates the executor used to run the `is_test_binary` probes.
+
+    A fork-based process pool fans the many short-lived probes out without GIL
+    contention; where `fork` is unavailable (Windows), a thread pool is used.
+
+    Args:
+        max_workers (int): Number of workers; a process pool forks all of them up front.
+
+    Returns:
+        concurrent.futures.Executor: The executor for the discovery probes.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+
+def _load_cache(cache_file):
+    """
+    Loads the discovery cache written by `_save_cache`.
+
+    Args:
+        cache_file (str): Path to the cache file.
+
+    Returns:
+        dict: Maps file paths to `[mtime_ns, size, is_gtest]`; empty if the cache
+              is missing or unreadable. Malformed entries are left out, so their
+              files are probed again.
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    return {path: entry for path, entry in cache.items()
+            if isinstance(entry, list) and len(entry) == 3 and isinstance(entry[2], bool)}
+
+
+def _save_cache(cache_file, cache):
+    """
+    Atomically replaces the discovery cache, keeping at most `CACHE_MAX_ENTRIES`
+    of the most recently seen entries.
+
+    Errors are ignored; a missing cache only costs a re-probe on the next run.
+
+    Args:
+        cache_file (str): Path to the cache file.
+        cache (dict): The cache entries, least recently seen first.
+    """
+    if len(cache) > CACHE_MAX_ENTRIES:
+        cache = dict(islice(cache.items(), len(cache) - CACHE_MAX_ENTRIES, None))
+    cache_dir = os.path.dirname(cache_file) or '.'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dumps(cache))
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def get_test_binaries(directory, cache_file=None):
     """
     Recursively searches the given directory for Google Test binaries.
 
+    Only executable files that pass the `_looks_like_gtest` prefilter are probed
+    with `is_test_binary`, so most non-test files never spawn a process. The
+    remaining probes run in parallel.
+
+    With a `cache_file`, the verdict for each file is stored together with its
+    modification time and size, and files that have not changed since the last
+    run are neither read nor probed again. Entries for files that have vanished
+    from the directory are dropped.
+
     Args:
         directory (str): The directory to search.
+        cache_file (str, optional): Path to the discovery cache. Defaults to None.
 
     Returns:
         list: A list of paths to Google Test binaries.
     """
-    test_binaries = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            if os.access(file_path, os.X_OK) and is_test_binary(file_path):
-                test_binaries.append(file_path)
-    return test_binaries
+    cache = {}
+    if cache_file:
+        # Absolute paths keep cache keys independent of the working directory.
+        directory = os.path.abspath(directory)
+        cache = _load_cache(cache_file)
+
+    seen = {}
+    candidates = []
+    for file_path, file_stat in _scan_tree(directory):
+        if not file_stat.st_mode & 0o111:
+            continue
+        key = [file_stat.st_mtime_ns, file_stat.st_size]
+        entry = cache.get(file_path)
+        if entry is not None and entry[:2] == key:
+            seen[file_path] = entry
+        elif _looks_like_gtest(file_path):
+            seen[file_path] = key
+            candidates.append(file_path)
+        else:
+            seen[file_path] = key + [False]
+
+    if candidates:
+        max_workers = min(os.cpu_count() or 1, len(candidates))
+        # Each probe spawns a process and may run for seconds, so hand them out
+        # one by one; chunking only pays off once there are many per worker.
+        chunksize = max(1, len(candidates) // (max_workers * 4))
+        with _probe_executor(max_workers) as executor:
+            verdicts = executor.map(is_test_binary, candidates, chunksize=chunksize)
+            for file_path, ok in zip(candidates, verdicts):
+                seen[file_path].append(ok)
+
+    if cache_file:
+        prefix = os.path.join(directory, '')
+        kept = {path: entry for path, entry in cache.items()
+                if not path.startswith(prefix) and path not in seen}
+        kept.update(seen)
+        _save_cache(cache_file, kept)
+
+    return [file_path for file_path, entry in seen.items() if entry[2]]
+
+
+def _parse_gtest_json(report_file, stream=False):
+    """
+    Parses a Google Test JSON report.
+
+    The report's bytes are decoded in one go with `orjson` when it is installed,
+    or with the standard `json` module. With `stream`, the optional `json_stream`
+    package reads it incrementally instead, one test case at a time, so memory
+    does not grow with the size of the report.
 
+    Args:
+        report_file (file object): The report, opened in binary mode.
+        stream (bool, optional): Whether to parse with `json_stream`. Defaults to False.
+
+    Returns:
+        tuple: The number of tests, number of failures, a list of failure reasons,
+               and the `GTestDetails` of the test cases.
 
-def run_test_binary(test_binary, timeout):
+    Raises:
+        KeyError: If the report lacks a required key; other errors in
+                  `REPORT_ERRORS` for reports that are otherwise malformed.
+    """
+    if stream:
+        report = json_stream.load(report_file)
+        materialize = json_stream.to_standard_types
+    else:
+        report = _loads(report_file.read())
+        materialize = None
+
+    num_tests = num_failures = None
+    failure_reasons = []
+    test_details = GTestDetails([], [], [], [])
+    add_reasons = failure_reasons.extend
+    add_name = test_details.names.append
+    add_status = test_details.statuses.append
+    add_time = test_details.times.append
+    add_message = test_details.failure_messages.append
+    # Top-level keys are taken in the order they appear, which works for
+    # json_stream's forward-only objects whatever order the writer used.
+    for key, value in report.items():
+        if key == 'tests':
+            num_tests = value
+        elif key == 'failures':
+            num_failures = value
+        elif key == 'testsuites':
+            for testsuite in value:
+                for test in testsuite['testsuite']:
+                    if materialize is not None:
+                        test = materialize(test)
+                    add_name(test['name'])
+                    add_time(test['time'])
+                    failures = test.get('failures', _EMPTY)
+                    if failures:
+                        messages = [failure['failure'] for failure in failures]
+                        add_reasons(messages)
+                        add_status('FAILED')
+                        add_message("\n".join(messages))
+                    else:
+                        add_status(test['result'])
+                        add_message('')
+    if num_tests is None or num_failures is None:
+        raise KeyError("report has no 'tests' or 'failures' count")
+    return num_tests, num_failures, failure_reasons, test_details
+
+
+async def run_test_binary(test_binary, timeout, argv, report_path):
     """
     Runs a Google Test binary and collects the test results.
 
+    The JSON report is written by the binary to `report_path` and parsed from
+    there; the console output is discarded instead of being buffered in memory.
+    The process is awaited on the event loop, so no thread is tied up per run.
+
     Args:
         test_binary (str): Path to the Google Test binary.
         timeout (int): Timeout for the test run in seconds.
+        argv (tuple): The command line, which points `--gtest_output` at `report_path`.
+        report_path (str): Path the binary writes its JSON report to.
 
     Returns:
-        tuple: A tuple containing the test binary path, number of tests, number of failures,
-               a list of failure reasons, detailed test results, start time, and end time.
+        BinResult: The results of the run.
     """
     start_time = datetime.now()
+    start_ns = time.monotonic_ns()
     try:
-        result = subprocess.run(
-            [test_binary, '--gtest_output=json'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=timeout,
-            check=True
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=False
         )
-        end_time = datetime.now()
-        output = result.stdout
         try:
-            result_json = json.loads(output)
-            num_tests = result_json['tests']
-            num_failures = result_json['failures']
-            failures = result_json.get('failures', [])
-            failure_reasons = [failure['message'] for failure in failures]
-            test_details = []
-            for testcase in result_json.get('testsuites', []):
-                for test in testcase['testsuite']:
-                    test_details.append({
-                        "test": test['name'],
-                        "status": test['result'],
-                        "time": test['time'],
-                        "failure_message": test.get('failure', {}).get('message', '') if test['result'] == 'FAILED' else ''
-                    })
-            return (test_binary, num_tests, num_failures, failure_reasons, test_details, start_time, end_time)
-        except json.JSONDecodeError:
-            return (test_binary, 0, 0, ["Failed to parse test output"], [], start_time, end_time)
-    except subprocess.TimeoutExpired:
-        end_time = datetime.now()
-        return (test_binary, 0, 0, ["Timeout expired"], [], start_time, end_time)
-    except subprocess.CalledProcessError as e:
-        end_time = datetime.now()
-        return (test_binary, 0, 0, [str(e)], [], start_time, end_time)
+            returncode = await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            duration_ns = time.monotonic_ns() - start_ns
+            return BinResult(test_binary, 0, 0, ["Timeout expired"], _NO_DETAILS, start_time, duration_ns)
+        duration_ns = time.monotonic_ns() - start_ns
+        try:
+            report_size = os.path.getsize(report_path)
+        except OSError:
+            report_size = 0
+        if not report_size:
+            reason = f"Test binary exited with code {returncode} without a test report"
+            return BinResult(test_binary, 0, 0, [reason], _NO_DETAILS, start_time, duration_ns)
+        try:
+            with open(report_path, 'rb') as report_file:
+                num_tests, num_failures, failure_reasons, test_details = \
+                    _parse_gtest_json(
+                        report_file, json_stream is not None and report_size >= STREAM_REPORT_SIZE)
+            return BinResult(test_binary, num_tests, num_failures, failure_reasons, test_details,
+                             start_time, duration_ns)
+        except REPORT_ERRORS:
+            return BinResult(test_binary, 0, 0, ["Failed to parse test output"], _NO_DETAILS, start_time, duration_ns)
+    finally:
+        try:
+            os.remove(report_path)
+        except FileNotFoundError:
+            pass
+
+
+async def _run_all(test_binaries, timeout, max_workers):
+    """
+    Runs the given Google Test binaries concurrently, at most `max_workers` at a time.
+
+    The command line and report path of every binary are built once up front,
+    with all reports of the batch going to one temporary directory.
+
+    Args:
+        test_binaries (list): Paths to the Google Test binaries to run.
+        timeout (int): Timeout for each test run in seconds.
+        max_workers (int): Maximum number of binaries running at once.
+
+    Returns:
+        list: The `BinResult` of each binary, in the order of `test_binaries`.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run_bounded(binary, argv, report_path):
+        async with semaphore:
+            return await run_test_binary(binary, timeout, argv, report_path)
+
+    with tempfile.TemporaryDirectory(prefix='gtest-reports-') as report_dir:
+        jobs = []
+        for index, binary in enumerate(test_binaries):
+            report_path = os.path.join(report_dir, f'{index}.json')
+            jobs.append((binary, (binary, f'--gtest_output=json:{report_path}'), report_path))
+        outcomes = await asyncio.gather(
+            *(run_bounded(*job) for job in jobs), return_exceptions=True)
+    results = []
+    for binary, outcome in zip(test_binaries, outcomes):
+        if isinstance(outcome, Exception):
+            outcome = BinResult(binary, 0, 0, [str(outcome)], _NO_DETAILS, datetime.now(), 0)
+        results.append(outcome)
+    return results
+
+
+def _run_batch(test_binaries, timeout, max_workers):
+    """
+    Runs the given Google Test binaries and waits for all of them to finish.
+
+    Args:
+        test_binaries (list): Paths to the Google Test binaries to run.
+        timeout (int): Timeout for each test run in seconds.
+        max_workers (int): Maximum number of binaries running at once.
+
+    Returns:
+        list: The `BinResult` of each binary, in the order of `test_binaries`.
+    """
+    if not test_binaries:
+        return []
+    return asyncio.run(_run_all(test_binaries, timeout, max_workers))
+
+
+_get_counts = attrgetter('num_tests', 'num_failures')
+
+
+def _totals(results):
+    """
+    Sums the test and failure counts of the given results in a single pass.
+
+    Args:
+        results (list): A list of test results.
+
+    Returns:
+        tuple: The total number of tests and the total number of failures.
+    """
+    total_tests = total_failures = 0
+    for num_tests, num_failures in map(_get_counts, results):
+        total_tests += num_tests
+        total_failures += num_failures
+    return total_tests, total_failures
 
 
 def write_summary(log, results):
     """
     Writes a summary of the test results to the log file.
 
+    The summary is assembled in memory and written with a single call.
+
     Args:
         log (file object): The log file to write to.
         results (list): A list of test results.
     """
-    total_tests = sum(result[1] for result in results)
-    total_failures = sum(result[2] for result in results)
-
-    log.write("\nSummary:\n")
-    log.write(f"  Total tests run: {total_tests}\n")
-    log.write(f"  Total failures: {total_failures}\n")
-
-    for binary, num_tests, num_failures, failure_reasons, test_details, start_time, end_time in results:
-        log.write(f"Binary: {binary}\n")
-        log.write(f"  Total tests: {num_tests}\n")
-        log.write(f"  Total failures: {num_failures}\n")
-        log.write(f"  Start time: {start_time}\n")
-        log.write(f"  End time: {end_time}\n")
-        log.write(f"  Duration: {end_time - start_time}\n")
-        if failure_reasons:
-            log.write("  Failure reasons:\n")
-            for reason in failure_reasons:
-                log.write(f"    - {reason}\n")
-        for detail in test_details:
-            status = detail["status"]
-            log.write(f"  Test: {detail['test']}\n")
-            log.write(f"    Status: {status}\n")
-            log.write(f"    Time: {detail['time']}\n")
-            if detail["failure_message"]:
-                log.write(f"    Failure message: {
-                          detail['failure_message']}\n")
-        log.write("\n")
-
-    log.write("Summary:\n")
-    log.write(f"  Total tests run: {total_tests}\n")
-    log.write(f"  Total failures: {total_failures}\n")
+    total_tests, total_failures = _totals(results)
+    parts = []
+    add = parts.append
+
+    add(f"\nSummary:\n"
+        f"  Total tests run: {total_tests}\n"
+        f"  Total failures: {total_failures}\n")
+
+    for result in results:
+        start_time = result.start_time
+        duration = timedelta(microseconds=result.duration_ns // 1000)
+        add(f"Binary: {result.binary}\n"
+            f"  Total tests: {result.num_tests}\n"
+            f"  Total failures: {result.num_failures}\n"
+            f"  Start time: {start_time}\n"
+            f"  End time: {start_time + duration}\n"
+            f"  Duration: {duration}\n")
+        if result.failure_reasons:
+            add("  Failure reasons:\n")
+            for reason in result.failure_reasons:
+                add(f"    - {reason}\n")
+        for name, status, test_time, failure_message in zip(*result.test_details):
+            add(f"  Test: {name}\n"
+                f"    Status: {status}\n"
+                f"    Time: {test_time}\n")
+            if failure_message:
+                add(f"    Failure message: {failure_message}\n")
+        add("\n")
+
+    log.write("".join(parts))
 
 
 def pytest_write_summary(results):
@@ -164,29 +611,32 @@ def pytest_write_summary(results):
     Returns:
         dict: A summary of the test results.
     """
-    total_tests = sum(result[1] for result in results)
-    total_failures = sum(result[2] for result in results)
-    summary = {
+    total_tests = total_failures = 0
+    details = []
+    add_details = details.append
+
+    for result in results:
+        total_tests += result.num_tests
+        total_failures += result.num_failures
+        start_time = result.start_time
+        duration = timedelta(microseconds=result.duration_ns // 1000)
+        add_details({
+            "binary": result.binary,
+            "total_tests": result.num_tests,
+            "total_failures": result.num_failures,
+            "start_time": start_time.isoformat(),
+            "end_time": (start_time + duration).isoformat(),
+            "duration": str(duration),
+            "failure_reasons": result.failure_reasons,
+            "test_details": result.test_details._asdict()
+        })
+
+    return {
         "total_tests": total_tests,
         "total_failures": total_failures,
-        "details": []
+        "details": details
     }
 
-    for binary, num_tests, num_failures, failure_reasons, test_details, start_time, end_time in results:
-        details = {
-            "binary": binary,
-            "total_tests": num_tests,
-            "total_failures": num_failures,
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "duration": str(end_time - start_time),
-            "failure_reasons": failure_reasons,
-            "test_details": test_details
-        }
-        summary["details"].append(details)
-
-    return summary
-
 
 @pytest.fixture(scope="session")
 def google_test_results(request):
@@ -203,18 +653,7 @@ def google_test_results(request):
     timeout = request.config.getoption("--gtest_timeout")
     max_workers = request.config.getoption("--gtest_max_workers")
     test_binaries = get_test_binaries(directory)
-
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_binary = {executor.submit(
-            run_test_binary, binary, timeout): binary for binary in test_binaries}
-        for future in concurrent.futures.as_completed(future_to_binary):
-            binary = future_to_binary[future]
-            try:
-                results.append(future.result())
-            except Exception as exc:
-                results.append(
-                    (binary, 0, 0, [str(exc)], [], datetime.now(), datetime.now()))
+    results = _run_batch(test_binaries, timeout, max_workers)
 
     return pytest_write_summary(results)
 
@@ -281,7 +720,7 @@ def pytest_terminal_summary(terminalreporter, config):
                 terminalreporter.write_line(f"    - {reason}")
 
 
-def main(directory, log_file, max_workers, only_failed, timeout, retries):
+def main(directory, log_file, max_workers, only_failed, timeout, retries, cache_file=None):
     """
     Main function to find, run, and log Google Test binaries.
 
@@ -292,50 +731,34 @@ def main(directory, log_file, max_workers, only_failed, timeout, retries):
         only_failed (bool): Whether to only rerun failed tests.
         timeout (int): Timeout for each test binary in seconds.
         retries (int): Number of retries for failed tests.
+        cache_file (str, optional): Path to the discovery cache. Defaults to None.
     """
-    test_binaries = get_test_binaries(directory)
+    test_binaries = get_test_binaries(directory, cache_file)
 
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_binary = {executor.submit(
-            run_test_binary, binary, timeout): binary for binary in test_binaries}
-        for future in concurrent.futures.as_completed(future_to_binary):
-            binary = future_to_binary[future]
-            try:
-                results.append(future.result())
-            except Exception as exc:
-                results.append(
-                    (binary, 0, 0, [str(exc)], [], datetime.now(), datetime.now()))
+    results = _run_batch(test_binaries, timeout, max_workers)
 
     with open(log_file, 'w', encoding="utf-8") as log:
         write_summary(log, results)
 
     if only_failed:
-        failed_tests = [result for result in results if result[2] > 0]
+        failed_tests = [result for result in results if result.num_failures > 0]
         if failed_tests:
             print("\nRe-running failed tests...")
+            all_retries = []
             for _ in range(retries):
-                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_binary = {executor.submit(
-                        run_test_binary, result[0], timeout): result[0] for result in failed_tests}
-                    new_results = []
-                    for future in concurrent.futures.as_completed(future_to_binary):
-                        binary = future_to_binary[future]
-                        try:
-                            new_results.append(future.result())
-                        except Exception as exc:
-                            new_results.append(
-                                (binary, 0, 0, [str(exc)], [], datetime.now(), datetime.now()))
+                new_results = _run_batch(
+                    [result.binary for result in failed_tests], timeout, max_workers)
 
+                all_retries.extend(new_results)
                 failed_tests = [
-                    result for result in new_results if result[2] > 0]
-                results.extend(new_results)
+                    result for result in new_results if result.num_failures > 0]
                 if not failed_tests:
                     break
 
-            with open(log_file, 'a', encoding="utf-8") as log:
-                log.write("\nRe-run Summary:\n")
-                write_summary(log, new_results)
+            if all_retries:
+                with open(log_file, 'a', encoding="utf-8") as log:
+                    log.write("\nRe-run Summary:\n")
+                    write_summary(log, all_retries)
 
     print(f"\nResults have been written to {log_file}")
 
@@ -373,8 +796,15 @@ if __name__ == "__main__":
         default=1,
         help="Number of retries for failed tests"
     )
+    parser.add_argument(
+        "--cache",
+        nargs='?',
+        const=CACHE_FILE,
+        default=None,
+        help=f"Cache discovery results between runs (default path: {CACHE_FILE})"
+    )
 
     args = parser.parse_args()
 
     main(args.directory, args.log_file, args.max_workers,
-         args.only_failed, args.timeout, args.retries)
+         args.only_failed, args.timeout, args.retries, args.cache)
@@ -0,0 +1,172 @@
+import concurrent.futures
+import importlib.util
+import io
+import json
+import os
+import sys
+import pytest
+
+# The runner lives in tests/test.py; load it by path, since `import test` would
+# pick up the standard library's `test` package.
+_spec = importlib.util.spec_from_file_location(
+    "gtest_runner", os.path.join(os.path.dirname(__file__), "test.py"))
+runner = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = runner
+_spec.loader.exec_module(runner)
+
+REPORT = {
+    "tests": 2,
+    "failures": 1,
+    "disabled": 0,
+    "name": "AllTests",
+    "testsuites": [{
+        "name": "Suite",
+        "tests": 2,
+        "testsuite": [
+            {"name": "Passes", "status": "RUN", "result": "COMPLETED", "time": "0s"},
+            {"name": "Fails", "status": "RUN", "result": "COMPLETED", "time": "0.01s",
+             "failures": [{"failure": "a.cc:3\nExpected equality", "type": ""},
+                          {"failure": "a.cc:4\nValue of: x", "type": ""}]},
+        ],
+    }],
+}
+
+
+@pytest.fixture(params=[False, True], ids=["decode", "stream"])
+def stream(request):
+    if request.param:
+        pytest.importorskip("json_stream")
+    return request.param
+
+
+def parse(report, stream):
+    return runner._parse_gtest_json(io.BytesIO(json.dumps(report).encode()), stream)
+
+
+def test_parse_gtest_json(stream):
+    num_tests, num_failures, failure_reasons, details = parse(REPORT, stream)
+    assert (num_tests, num_failures) == (2, 1)
+    assert failure_reasons == ["a.cc:3\nExpected equality", "a.cc:4\nValue of: x"]
+    assert details.names == ["Passes", "Fails"]
+    assert details.statuses == ["COMPLETED", "FAILED"]
+    assert details.times == ["0s", "0.01s"]
+    assert details.failure_messages == ["", "a.cc:3\nExpected equality\na.cc:4\nValue of: x"]
+
+
+def test_parse_gtest_json_key_order(stream):
+    report = {"testsuites": REPORT["testsuites"], "failures": 1, "tests": 2}
+    num_tests, num_failures, _, details = parse(report, stream)
+    assert (num_tests, num_failures) == (2, 1)
+    assert details.names == ["Passes", "Fails"]
+
+
+@pytest.mark.parametrize("report", [
+    {"tests": 1},
+    {"tests": 1, "failures": 0, "testsuites": [{"name": "Suite"}]},
+    {"tests": 1, "failures": 0, "testsuites": [{"testsuite": [{"name": "NoTime"}]}]},
+    [1],
+], ids=["missing-failures", "missing-testsuite", "missing-time", "not-an-object"])
+def test_parse_gtest_json_malformed(report, stream):
+    with pytest.raises(runner.REPORT_ERRORS):
+        parse(report, stream)
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b"\x7fELF\x02\x01" + b"\0" * 64 + b"--gtest_list_tests", True),
+    (b"MZ\x90\0" + b"\0" * 64 + b"_ZN7testing4TestC2Ev", True),
+    (b"\xcf\xfa\xed\xfe" + b"\0" * 64 + b"?Run@Test@testing@@QEAAXXZ", True),
+    (b"\x7fELF\x02\x01" + b"\0" * 64 + b"main", False),
+    (b"#!/bin/sh\nexec ./.libs/test_foo \"$@\"\n", True),
+    (b"\x7fELF\x02\x01" + b"\0" * 64 + b"#!", False),
+    (b"", False),
+], ids=["elf", "pe", "macho", "elf-without-gtest", "wrapper-script", "elf-with-shebang-bytes", "empty"])
+def test_looks_like_gtest(tmp_path, content, expected):
+    target = tmp_path / "binary"
+    target.write_bytes(content)
+    assert runner._looks_like_gtest(str(target)) == expected
+
+
+def test_looks_like_gtest_missing_file(tmp_path):
+    assert runner._looks_like_gtest(str(tmp_path / "missing")) == False
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    probed = []
+
+    def fake_probe(file_path):
+        probed.append(file_path)
+        return True
+
+    monkeypatch.setattr(runner, "is_test_binary", fake_probe)
+    monkeypatch.setattr(runner, "_probe_executor", concurrent.futures.ThreadPoolExecutor)
+    return probed
+
+
+def make_binary(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x7fELF" + b"\0" * 16 + b"--gtest_list_tests")
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_get_test_binaries_cache(tmp_path, probes):
+    cache_file = str(tmp_path / "cache" / "gtest-runner.json")
+    first = make_binary(tmp_path / "bin" / "a" / "first")
+    second = make_binary(tmp_path / "bin" / "b" / "second")
+
+    found = runner.get_test_binaries(str(tmp_path / "bin"), cache_file)
+    assert sorted(found) == [first, second]
+    assert sorted(probes) == [first, second]
+
+    probes.clear()
+    assert sorted(runner.get_test_binaries(str(tmp_path / "bin"), cache_file)) == [first, second]
+    assert probes == []
+
+    # A changed file is probed again; a removed one is dropped from the cache.
+    with open(first, "ab") as f:
+        f.write(b"changed")
+    os.remove(second)
+    assert runner.get_test_binaries(str(tmp_path / "bin"), cache_file) == [first]
+    assert probes == [first]
+    assert sorted(runner._load_cache(cache_file)) == [first]
+
+
+def test_get_test_binaries_cache_keeps_other_directories(tmp_path, probes):
+    cache_file = str(tmp_path / "gtest-runner.json")
+    other = make_binary(tmp_path / "other" / "test")
+    runner.get_test_binaries(str(tmp_path / "other"), cache_file)
+    runner.get_test_binaries(str(tmp_path / "bin"), cache_file)
+    assert other in runner._load_cache(cache_file)
+
+
+def test_load_cache_unreadable(tmp_path):
+    assert runner._load_cache(str(tmp_path / "missing.json")) == {}
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_bytes(b"{not json")
+    assert runner._load_cache(str(corrupt)) == {}
+    not_a_dict = tmp_path / "list.json"
+    not_a_dict.write_bytes(b"[1, 2]")
+    assert runner._load_cache(str(not_a_dict)) == {}
+    malformed = tmp_path / "malformed.json"
+    malformed.write_bytes(json.dumps({
+        "number": 5, "no-verdict": [1, 2], "int-verdict": [1, 2, 1], "ok": [1, 2, True]
+    }).encode())
+    assert runner._load_cache(str(malformed)) == {"ok": [1, 2, True]}
+
+
+def test_get_test_binaries_malformed_cache_entry(tmp_path, probes):
+    cache_file = tmp_path / "gtest-runner.json"
+    binary = make_binary(tmp_path / "bin" / "test")
+    stat = os.stat(binary)
+    cache_file.write_bytes(json.dumps({binary: [stat.st_mtime_ns, stat.st_size]}).encode())
+    assert runner.get_test_binaries(str(tmp_path / "bin"), str(cache_file)) == [binary]
+    assert probes == [binary]
+
+
+def test_save_cache_keeps_most_recent_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "CACHE_MAX_ENTRIES", 2)
+    cache_file = str(tmp_path / "gtest-runner.json")
+    runner._save_cache(cache_file, {"old": [1, 1, True], "mid": [2, 2, False], "new": [3, 3, True]})
+    assert runner._load_cache(cache_file) == {"mid": [2, 2, False], "new": [3, 3, True]}
+    assert os.listdir(tmp_path) == ["gtest-runner.json"]